@@ -9,11 +9,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import logging.handlers
 import os
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+import sys
+import time
 from typing import Any, Awaitable, Callable, Dict, Optional
 
+try:
+  from .state import MandyRuntimeState  # type: ignore
+except ImportError:  # pragma: no cover - fallback for direct execution
+  from state import MandyRuntimeState
+
 try:
   # Pipecat imports guarded so the skeleton can exist without the dependency
   from pipecat.pipeline.pipeline import Pipeline
@@ -21,6 +27,7 @@ try:
   from pipecat.pipeline.task import PipelineParams, PipelineTask
   from pipecat.processors.aggregators.openai_llm_context import (
     OpenAILLMContext,
+    OpenAILLMContextFrame,
   )
   from pipecat.services.cartesia.tts import CartesiaTTSService
   from pipecat.services.deepgram.stt import DeepgramSTTService
@@ -31,6 +38,7 @@ try:
     DailyTransportMessageFrame,
   )
   from pipecat.audio.vad.silero import SileroVADAnalyzer
+  from deepgram import LiveOptions
   from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
   from pipecat.frames.frames import Frame, TranscriptionFrame, TextFrame
 except ImportError as exc:  # pragma: no cover - informative failure
@@ -41,50 +49,81 @@ except ImportError as exc:  # pragma: no cover - informative failure
 
 logger = logging.getLogger("mandy")
 
+# Window in which bursts of state updates collapse into one app-message.
+PUBLISH_COALESCE_SECONDS = 0.05
+
+# Signature shared by MandyBot's control-action handlers.
+ControlHandler = Callable[[Dict[str, Any], str], Awaitable[Optional[str]]]
+
 
 class DebugFrameProcessor(FrameProcessor):
-  """Debug processor to log all frames passing through the pipeline."""
+  """
+  Debug processor that logs the transcription and text frames passing its
+  position in the pipeline.
+
+  Audio and control frames dominate traffic, so the handler for each concrete
+  frame type is resolved once and cached; unhandled types fall straight through
+  to `push_frame` with a single dict lookup.
+  """
+
+  def __init__(self, **kwargs: Any) -> None:
+    super().__init__(**kwargs)
+    self._dispatch: Dict[type, Optional[Callable[[Frame], None]]] = {}
+
+  def _resolve_handler(
+    self, frame_type: type
+  ) -> Optional[Callable[[Frame], None]]:
+    # TranscriptionFrame subclasses TextFrame, so it must be checked first.
+    if issubclass(frame_type, TranscriptionFrame):
+      return self._log_transcription
+    if issubclass(frame_type, TextFrame):
+      return self._log_text
+    return None
+
+  def _log_transcription(self, frame: TranscriptionFrame) -> None:
+    logger.debug("TranscriptionFrame: %r (user_id=%s)", frame.text, frame.user_id)
+
+  def _log_text(self, frame: TextFrame) -> None:
+    logger.debug("TextFrame: %r", frame.text)
 
   async def process_frame(self, frame: Frame, direction: FrameDirection):
-    import sys
     await super().process_frame(frame, direction)
 
-    if isinstance(frame, TranscriptionFrame):
-      print(f"[MANDY-DEBUG] TranscriptionFrame: '{frame.text}' (user_id={getattr(frame, 'user_id', 'N/A')})", file=sys.stderr, flush=True)
-      logger.info(f"Transcription: {frame.text}")
-    elif isinstance(frame, TextFrame):
-      print(f"[MANDY-DEBUG] TextFrame: '{frame.text}'", file=sys.stderr, flush=True)
-      logger.info(f"Text: {frame.text}")
+    if logger.isEnabledFor(logging.DEBUG):
+      frame_type = type(frame)
+      try:
+        handler = self._dispatch[frame_type]
+      except KeyError:
+        handler = self._dispatch[frame_type] = self._resolve_handler(frame_type)
+      if handler is not None:
+        handler(frame)
 
     await self.push_frame(frame, direction)
 
 
-@dataclass
-class MandyRuntimeState:
-  version: int = 0
-  mode: str = "silent"
-  muted: bool = True
-  directive: str = ""
-  locked_by: Optional[str] = None
-  updated_by: Optional[str] = None
-  status: str = "connecting"
-  pending_reason: Optional[str] = None
-  updated_at: datetime = field(
-    default_factory=lambda: datetime.now(timezone.utc)
-  )
+class ModeGate(FrameProcessor):
+  """
+  Holds back LLM turns while Mandy is muted or in silent mode.
 
-  def to_payload(self) -> Dict[str, Any]:
-    return {
-      "version": self.version,
-      "mode": self.mode,
-      "muted": self.muted,
-      "directive": self.directive,
-      "lockedBy": self.locked_by,
-      "updatedBy": self.updated_by,
-      "status": self.status,
-      "pendingReason": self.pending_reason,
-      "updatedAt": self.updated_at.isoformat(),
-    }
+  Sits between the user context aggregator and the LLM. The aggregator has
+  already recorded the user's message, so the conversation history stays
+  complete; only the context frame that would trigger a completion (and the
+  TTS after it) is dropped.
+  """
+
+  def __init__(self, state: MandyRuntimeState, **kwargs: Any) -> None:
+    super().__init__(**kwargs)
+    self._state = state
+
+  async def process_frame(self, frame: Frame, direction: FrameDirection):
+    await super().process_frame(frame, direction)
+
+    if isinstance(frame, OpenAILLMContextFrame) and (
+      self._state.muted or self._state.mode == "silent"
+    ):
+      return
+
+    await self.push_frame(frame, direction)
 
 
 class MandyBot:
@@ -117,6 +156,21 @@ class MandyBot:
     self.task: Optional[PipelineTask] = None
     self._run_task: Optional[asyncio.Task] = None
     self._state_callback = state_callback
+    self._last_state_payload: Optional[Dict[str, Any]] = None
+    # Participant id -> display name, resolved once when they join.
+    self._participants: Dict[str, str] = {}
+    self._last_message: Optional[Dict[str, Any]] = None
+    self._publish_task: Optional[asyncio.Task] = None
+    self._actions: Dict[str, ControlHandler] = {
+      "mandy:mute": self._mute,
+      "mandy:unmute": self._unmute,
+      "mandy:set_mode": self._set_mode,
+      "mandy:update_directive": self._update_directive,
+      "mandy:lock_mode": self._lock,
+      "mandy:unlock_mode": self._unlock,
+      "mandy:stop": self._stop,
+      "mandy:start": self._start_action,
+    }
     self.context = OpenAILLMContext(
       messages=[
         {
@@ -135,130 +189,152 @@ class MandyBot:
       logger.info("Mandy already running for %s", self.room_url)
       return
 
-    async def _run() -> None:
-      import sys
-      print(f"[MANDY] Starting Mandy for {self.room_url}", file=sys.stderr, flush=True)
-      logger.info("Starting Mandy for %s", self.room_url)
-      await self.publish_state(status="connecting")
-      print("[MANDY] Published connecting state", file=sys.stderr, flush=True)
-
-      # Create transport with VAD passthrough like Dot
-      params = DailyParams(
-        audio_in_enabled=True,
-        audio_out_enabled=True,
-        transcription_enabled=False,
-        vad_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(),
-        vad_audio_passthrough=True,  # Key: pass audio through even during VAD
-      )
+    self._run_task = asyncio.create_task(self._run())
+
+  async def _run(self) -> None:
+    """Build the transport and pipeline, then run it until cancelled."""
+    logger.info("Starting Mandy for %s", self.room_url)
+    await self.publish_state(status="connecting")
+
+    # Create transport with VAD passthrough like Dot. Pipecat's input transport
+    # already runs VAD analysis in a thread executor, and the Silero ONNX
+    # session is single-threaded; with one bot per process (runner.py) there
+    # is no cross-room oversubscription to guard against.
+    params = DailyParams(
+      audio_in_enabled=True,
+      audio_out_enabled=True,
+      transcription_enabled=False,
+      vad_enabled=True,
+      vad_analyzer=SileroVADAnalyzer(),
+      vad_audio_passthrough=True,  # Key: pass audio through even during VAD
+    )
 
-      self.transport = DailyTransport(
-        self.room_url,
-        self.daily_token or None,
-        "Mandy",
-        params,
-      )
+    self.transport = DailyTransport(
+      self.room_url,
+      self.daily_token or None,
+      "Mandy",
+      params,
+    )
 
-      # Set up event handlers like Dot
-      @self.transport.event_handler("on_participant_joined")
-      async def on_participant_joined(transport, participant):
-        participant_id = participant['id']
-        info = participant.get('info', {})
-        user_name = info.get('userName', 'Guest')
-        logger.info(f"Participant joined: {user_name} (ID: {participant_id})")
-
-      @self.transport.event_handler("on_participant_left")
-      async def on_participant_left(transport, participant, reason):
-        participant_id = participant['id']
-        logger.info(f"Participant left: {participant_id}, reason: {reason}")
-
-      @self.transport.event_handler("on_first_participant_joined")
-      async def on_first_participant_joined(transport, participant):
-        logger.info("First participant joined - Mandy is now active")
-        await self.publish_state(status="online")
-
-      print("[MANDY] Event handlers registered", file=sys.stderr, flush=True)
-
-      # Create services - same config as Dot
-      print("[MANDY] Creating STT service...", file=sys.stderr, flush=True)
-      stt = DeepgramSTTService(
-        api_key=os.environ.get("DEEPGRAM_API_KEY", "")
-      )
-      print("[MANDY] Creating LLM service...", file=sys.stderr, flush=True)
-      llm = OpenAILLMService(
-        api_key=os.environ.get("OPENAI_API_KEY", ""),
-        model="gpt-4",
-        messages=self.context.messages  # Pass initial system message
+    # Set up event handlers like Dot
+    self.transport.event_handler("on_participant_joined")(
+      self._on_participant_joined
+    )
+    self.transport.event_handler("on_participant_left")(
+      self._on_participant_left
+    )
+    self.transport.event_handler("on_first_participant_joined")(
+      self._on_first_participant_joined
+    )
+
+    # Create services - same config as Dot
+    # Explicit streaming options: raw PCM skips container sniffing, and a
+    # short endpointing window finalizes transcripts sooner. Pipecat already
+    # sends Deepgram's Finalize message on UserStoppedSpeakingFrame.
+    stt = DeepgramSTTService(
+      api_key=os.environ.get("DEEPGRAM_API_KEY", ""),
+      live_options=LiveOptions(
+        encoding="linear16",
+        sample_rate=16000,
+        channels=1,
+        model="nova-3",
+        language="en",
+        interim_results=True,
+        endpointing=300,
+        smart_format=True,
+        no_delay=True,
+        utterance_end_ms="1000",
+      ),
+    )
+    # The system message stays the first, unchanged entry of the context so
+    # OpenAI's automatic prefix caching can reuse it across turns.
+    llm = OpenAILLMService(
+      api_key=os.environ.get("OPENAI_API_KEY", ""),
+      model=os.environ.get("MANDY_LLM_MODEL", "gpt-4o-mini"),
+    )
+    tts = CartesiaTTSService(
+      api_key=os.environ.get("CARTESIA_API_KEY", ""),
+      voice_id="71a7ad14-091c-4e8e-a314-022ece01c121",  # Same voice as Dot
+    )
+
+    # Bridge transcripts to the LLM and persist conversation context. The pair
+    # is not a processor itself: user() must sit upstream of the LLM to turn
+    # transcripts into context frames, and assistant() must sit after the
+    # output so it records only what Mandy actually said.
+    context_aggregator = llm.create_context_aggregator(self.context)
+
+    # Frame logging is for development only; in production it is left out of
+    # the pipeline entirely so frames skip the extra hops. One logger sits
+    # after STT (transcripts) and one after the LLM (its streamed text), since
+    # each kind of frame is produced at that point and only flows downstream.
+    debug = bool(os.environ.get("MANDY_DEBUG"))
+    stt_debug = [DebugFrameProcessor()] if debug else []
+    llm_debug = [DebugFrameProcessor()] if debug else []
+
+    # Build pipeline
+    try:
+      pipeline = Pipeline(
+        [
+          self.transport.input(),
+          stt,
+          *stt_debug,
+          context_aggregator.user(),
+          ModeGate(self.state),
+          llm,
+          *llm_debug,
+          tts,
+          self.transport.output(),
+          context_aggregator.assistant(),
+        ]
       )
-      print("[MANDY] Creating TTS service...", file=sys.stderr, flush=True)
-      tts = CartesiaTTSService(
-        api_key=os.environ.get("CARTESIA_API_KEY", ""),
-        voice_id="71a7ad14-091c-4e8e-a314-022ece01c121",  # Same voice as Dot
+    except Exception:
+      logger.exception("Error building Mandy pipeline for %s", self.room_url)
+      raise
+
+    self.task = PipelineTask(
+      pipeline,
+      params=PipelineParams(
+        enable_metrics=True,
+        enable_usage_metrics=True,
+      ),
+    )
+    self.runner = PipelineRunner(handle_sigint=False)
+
+    logger.info("Mandy init: room=%s", self.room_url)
+    try:
+      await self.runner.run(self.task)
+      logger.warning("Pipeline runner completed unexpectedly for %s", self.room_url)
+    except asyncio.CancelledError:
+      logger.info("Mandy runner cancelled for %s", self.room_url)
+    except Exception as e:  # pragma: no cover
+      logger.exception("Unexpected Mandy pipeline error: %s", e)
+      await self.publish_state(status="error")
+    finally:
+      logger.debug(
+        "Pipeline cleanup for %s - current status: %s",
+        self.room_url,
+        self.state.status,
       )
-      print("[MANDY] All services created", file=sys.stderr, flush=True)
+      if self.state.status != "disconnected":
+        await self.publish_state(status="disconnected")
 
-      # Bridge transcripts to the LLM and persist conversation context
-      context_aggregator = llm.create_context_aggregator(self.context)
-      print("[MANDY] Context aggregator created", file=sys.stderr, flush=True)
+  # Daily transport event handlers
 
-      # Build pipeline
-      print("[MANDY] Building pipeline...", file=sys.stderr, flush=True)
-      try:
-        pipeline = Pipeline(
-          [
-            self.transport.input(),
-            stt,
-            context_aggregator.user(),
-            llm,
-            tts,
-            self.transport.output(),
-            context_aggregator.assistant(),
-          ]
-        )
-        print("[MANDY] Pipeline built", file=sys.stderr, flush=True)
-      except Exception as e:
-        print(f"[MANDY] ERROR building pipeline: {e}", file=sys.stderr, flush=True)
-        import traceback
-        traceback.print_exc()
-        raise
-
-      print("[MANDY] Creating pipeline task...", file=sys.stderr, flush=True)
-      self.task = PipelineTask(
-        pipeline,
-        params=PipelineParams(
-          enable_metrics=True,
-          enable_usage_metrics=True,
-        ),
-      )
-      print("[MANDY] Pipeline task created", file=sys.stderr, flush=True)
+  async def _on_participant_joined(self, transport, participant) -> None:
+    participant_id = participant['id']
+    info = participant.get('info') or {}
+    user_name = info.get('userName', 'Guest')
+    self._participants[participant_id] = user_name
+    logger.info("Participant joined: %s (ID: %s)", user_name, participant_id)
 
-      print("[MANDY] Creating pipeline runner...", file=sys.stderr, flush=True)
-      self.runner = PipelineRunner(handle_sigint=False)
-      print("[MANDY] Pipeline runner created", file=sys.stderr, flush=True)
+  async def _on_participant_left(self, transport, participant, reason) -> None:
+    participant_id = participant['id']
+    user_name = self._participants.pop(participant_id, participant_id)
+    logger.info("Participant left: %s, reason: %s", user_name, reason)
 
-      print("[MANDY] Pipeline created, starting runner...", file=sys.stderr, flush=True)
-      logger.info("Mandy pipeline created, starting runner...")
-      try:
-        print("[MANDY] About to run pipeline...", file=sys.stderr, flush=True)
-        await self.runner.run(self.task)
-        print(f"[MANDY] Pipeline run completed normally for {self.room_url}", file=sys.stderr, flush=True)
-        logger.warning(f"Pipeline runner completed unexpectedly for {self.room_url}")
-      except asyncio.CancelledError:
-        print(f"[MANDY] Pipeline cancelled for {self.room_url}", file=sys.stderr, flush=True)
-        logger.info("Mandy runner cancelled for %s", self.room_url)
-      except Exception as e:  # pragma: no cover
-        print(f"[MANDY] Pipeline error: {e}", file=sys.stderr, flush=True)
-        logger.exception(f"Unexpected Mandy pipeline error: {e}")
-        await self.publish_state(status="error")
-      finally:
-        print(f"[MANDY] Pipeline cleanup - current status: {self.state.status}", file=sys.stderr, flush=True)
-        if self.state.status != "disconnected":
-          print(f"[MANDY] Setting status to disconnected for {self.room_url}", file=sys.stderr, flush=True)
-          await self.publish_state(status="disconnected")
-
-    print(f"[MANDY] Creating asyncio task for {self.room_url}")
-    self._run_task = asyncio.create_task(_run())
-    print("[MANDY] Task created")
+  async def _on_first_participant_joined(self, transport, participant) -> None:
+    logger.info("First participant joined - Mandy is now active")
+    await self.publish_state(status="online")
 
   def is_running(self) -> bool:
     return bool(self._run_task and not self._run_task.done())
@@ -273,58 +349,118 @@ class MandyBot:
     requested_by = payload.get("requestedBy", "unknown")
     self.state.version += 1
     self.state.updated_by = requested_by
-    self.state.updated_at = datetime.now(timezone.utc)
-
-    if action == "mandy:mute":
-      self.state.muted = True
-      logger.info("Mandy muted by %s", requested_by)
-    elif action == "mandy:unmute":
-      self.state.muted = False
-      logger.info("Mandy unmuted by %s", requested_by)
-    elif action == "mandy:set_mode":
-      self.state.mode = payload.get("mode", self.state.mode)
-      logger.info("Mandy mode set to %s by %s", self.state.mode, requested_by)
-    elif action == "mandy:update_directive":
-      self.state.directive = payload.get("directive", self.state.directive)
-      logger.info("Directive updated by %s: %s", requested_by, self.state.directive)
-    elif action == "mandy:lock_mode":
-      self.state.locked_by = requested_by
-      logger.info("Controls locked by %s", requested_by)
-    elif action == "mandy:unlock_mode":
-      self.state.locked_by = None
-      logger.info("Controls unlocked by %s", requested_by)
-    elif action == "mandy:stop":
-      logger.info("Received stop command from %s", requested_by)
-      await self.shutdown()
-      await self.publish_state(status="disconnected")
-      return
-    elif action == "mandy:start":
-      logger.info("Start acknowledged from %s", requested_by)
-      await self.start()
-
-    await self.publish_state()
+    self.state.updated_at_ns = time.time_ns()
+
+    handler = self._actions.get(action)
+    status = await handler(payload, requested_by) if handler else None
+    self.state.invalidate()
+    await self.publish_state(status=status)
+
+  # Control handlers. Each mutates state for one action and may return a
+  # status to publish alongside the update.
+
+  async def _mute(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    self.state.muted = True
+    logger.info("Mandy muted by %s", requested_by)
+    return None
+
+  async def _unmute(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    self.state.muted = False
+    logger.info("Mandy unmuted by %s", requested_by)
+    return None
+
+  async def _set_mode(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    self.state.mode = payload.get("mode", self.state.mode)
+    logger.info("Mandy mode set to %s by %s", self.state.mode, requested_by)
+    return None
+
+  async def _update_directive(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    self.state.directive = payload.get("directive", self.state.directive)
+    logger.info("Directive updated by %s: %s", requested_by, self.state.directive)
+    return None
+
+  async def _lock(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    self.state.locked_by = requested_by
+    logger.info("Controls locked by %s", requested_by)
+    return None
+
+  async def _unlock(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    self.state.locked_by = None
+    logger.info("Controls unlocked by %s", requested_by)
+    return None
+
+  async def _stop(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    logger.info("Received stop command from %s", requested_by)
+    await self.shutdown()
+    return "disconnected"
+
+  async def _start_action(self, payload: Dict[str, Any], requested_by: str) -> Optional[str]:
+    logger.info("Start acknowledged from %s", requested_by)
+    await self.start()
+    return None
 
   async def publish_state(self, status: Optional[str] = None) -> None:
-    """Broadcast Mandy's state to the room via Daily app messages."""
+    """
+    Broadcast Mandy's state to the room via Daily app messages.
+
+    Status transitions are sent immediately. Plain state updates are
+    coalesced: the first schedules a send `PUBLISH_COALESCE_SECONDS` later and
+    any updates in that window ride along, since the send reads the latest
+    state. The backend callback always fires immediately.
+    """
     if status:
       self.state.status = status
-    payload = {
-      "type": "mandy/state",
-      "state": self.state.to_payload(),
-    }
-    logger.debug("Publishing state: %s", payload)
+      self.state.invalidate()
     if self.task:
-      try:
-        await self.task.queue_frame(
-          DailyTransportMessageFrame(message=payload)
+      if status:
+        self._cancel_pending_publish()
+        await self._send_state()
+      elif self._publish_task is None or self._publish_task.done():
+        self._publish_task = asyncio.create_task(
+          self._flush_publish_after(PUBLISH_COALESCE_SECONDS)
         )
-      except Exception:  # pragma: no cover - we still surface to backend
-        logger.exception("Unable to send app-message update")
 
     if self._state_callback:
       await self._state_callback(self.state)
 
+  async def _flush_publish_after(self, delay: float) -> None:
+    await asyncio.sleep(delay)
+    await self._send_state()
+
+  def _cancel_pending_publish(self) -> None:
+    if self._publish_task and not self._publish_task.done():
+      self._publish_task.cancel()
+    self._publish_task = None
+
+  async def _send_state(self) -> None:
+    state_payload = self.state.to_payload()
+    # to_payload hands back the same dict until the state changes, so the
+    # app-message envelope can be reused for repeated publishes.
+    if state_payload is not self._last_state_payload:
+      self._last_state_payload = state_payload
+      self._last_message = {
+        "type": "mandy/state",
+        "state": state_payload,
+      }
+    payload = self._last_message
+    logger.debug("Publishing state: %s", payload)
+    try:
+      await self.task.queue_frame(
+        DailyTransportMessageFrame(message=payload)
+      )
+    except Exception:  # pragma: no cover - we still surface to backend
+      logger.exception("Unable to send app-message update")
+
+  async def wait_closed(self) -> None:
+    """Block until the pipeline task started by `start` has finished."""
+    if self._run_task:
+      try:
+        await self._run_task
+      except asyncio.CancelledError:
+        pass
+
   async def shutdown(self) -> None:
+    self._cancel_pending_publish()
     if self._run_task and not self._run_task.done():
       self._run_task.cancel()
     if self.task:
@@ -332,6 +468,7 @@ class MandyBot:
     if self.transport:
       await self.transport.close()
     self.state.status = "disconnected"
+    self.state.invalidate()
     logger.info("Mandy shutdown complete")
     if self._state_callback:
       await self._state_callback(self.state)
@@ -349,8 +486,41 @@ async def main() -> None:
 
   bot = MandyBot(room_url=room_url, daily_token=room_token)
   await bot.start()
+  await bot.wait_closed()
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+  """
+  Buffer debug records in memory and write them to stderr in batches, so
+  per-frame debug output does not cost a write() each. Any INFO or higher
+  record flushes the buffer, so operational logs are never held back.
+  """
+  stream = logging.StreamHandler(sys.stderr)
+  stream.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+  )
+  buffered = logging.handlers.MemoryHandler(
+    capacity=256,
+    flushLevel=logging.INFO,
+    target=stream,
+  )
+  root = logging.getLogger()
+  root.setLevel(level)
+  root.addHandler(buffered)
+
+
+def run_event_loop(coro: Awaitable[None]) -> None:
+  """Run `coro` to completion on uvloop when installed, else on asyncio's loop."""
+  try:
+    import uvloop
+  except ImportError:
+    asyncio.run(coro)
+  else:
+    uvloop.run(coro)
 
 
 if __name__ == "__main__":
-  logging.basicConfig(level=logging.INFO)
-  asyncio.run(main())
+  configure_logging(
+    logging.DEBUG if os.environ.get("MANDY_DEBUG") else logging.INFO
+  )
+  run_event_loop(main())
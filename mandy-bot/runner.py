@@ -0,0 +1,316 @@
+"""
+Process-per-room runner for Mandy.
+
+The control plane spawns one bot process per room so every Pipecat pipeline
+gets its own interpreter (and GIL) instead of competing with the FastAPI event
+loop. Parent and child speak newline-delimited JSON over the child's pipes:
+
+- stdin (parent -> child): the first line is `{"state": {...}}`, the state to
+  resume from (`{}` starts fresh). It travels over the pipe rather than argv
+  so the operator's directive never shows up in `ps` or hits argument length
+  limits. After that, `{"id": n, "control": {...}}` forwards a control
+  payload to `MandyBot.apply_control` and is answered with `{"type": "ack"}`.
+- stdout (child -> parent): `{"type": "state", "state": {...}}` on every state
+  update, mirroring the in-process `state_callback`.
+
+Closing the child's stdin asks it to shut down. Run a child directly with
+`python runner.py --room-url <url>` (token in `MANDY_ROOM_TOKEN`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import sys
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+
+try:
+  from .state import MandyRuntimeState  # type: ignore
+except ImportError:  # pragma: no cover - fallback for direct execution
+  from state import MandyRuntimeState
+
+logger = logging.getLogger("mandy.runner")
+
+RUNNER_PATH = os.path.abspath(__file__)
+TOKEN_ENV = "MANDY_ROOM_TOKEN"
+SHUTDOWN_TIMEOUT = 10.0
+REQUEST_TIMEOUT = 15.0
+
+
+def _load_bot_module():
+  """
+  Import bot.py (and with it the Pipecat stack) on demand. Only the child
+  process needs it; the control plane imports this module for
+  `MandyBotProcess` and must not require the voice pipeline dependencies.
+  """
+  try:
+    from . import bot  # type: ignore
+  except ImportError:  # pragma: no cover - fallback for direct execution
+    import bot
+  return bot
+
+
+class MandyBotProcess:
+  """
+  Parent-side handle for a bot running in its own process. Exposes the
+  start/apply_control/shutdown surface of `MandyBot`, keeping a mirror of the
+  child's state that is refreshed from its state messages.
+  """
+
+  def __init__(
+    self,
+    room_url: str,
+    daily_token: str,
+    initial_directive: str = "",
+    state_callback: Optional[
+      Callable[[MandyRuntimeState], Awaitable[None]]
+    ] = None,
+    initial_state: Optional[MandyRuntimeState] = None,
+    runner_path: str = RUNNER_PATH,
+  ) -> None:
+    self.room_url = room_url
+    self.runner_path = runner_path
+    self.daily_token = daily_token
+    if initial_state is None:
+      self.state = MandyRuntimeState(
+        directive=initial_directive,
+        status="connecting",
+      )
+    else:
+      # Resuming a room: continue one version past its last known state so
+      # clients, which only accept monotonic versions, take the new updates.
+      self.state = initial_state
+      self.state.version += 1
+      self.state.status = "connecting"
+      if initial_directive:
+        self.state.directive = initial_directive
+      self.state.invalidate()
+    self._state_callback = state_callback
+    self._proc: Optional[asyncio.subprocess.Process] = None
+    self._reader_task: Optional[asyncio.Task] = None
+    self._pending: Dict[int, asyncio.Future] = {}
+    self._ids = itertools.count()
+
+  async def start(self) -> None:
+    if self.is_running():
+      logger.info("Mandy already running for %s", self.room_url)
+      return
+
+    # The token goes through the environment so it never shows up in `ps`.
+    self._proc = await asyncio.create_subprocess_exec(
+      sys.executable,
+      self.runner_path,
+      "--room-url",
+      self.room_url,
+      stdin=asyncio.subprocess.PIPE,
+      stdout=asyncio.subprocess.PIPE,
+      env={**os.environ, TOKEN_ENV: self.daily_token},
+    )
+    logger.info("Spawned Mandy process %s for %s", self._proc.pid, self.room_url)
+    # Hand over the current state so versions stay monotonic on restart.
+    self._proc.stdin.write(
+      orjson.dumps({"state": self.state.to_payload()}) + b"\n"
+    )
+    await self._proc.stdin.drain()
+    self._reader_task = asyncio.create_task(self._read_messages(self._proc))
+
+  def is_running(self) -> bool:
+    return bool(self._proc and self._proc.returncode is None)
+
+  async def apply_control(self, payload: Dict[str, Any]) -> None:
+    if not self.is_running():
+      logger.warning(
+        "Dropping %s for %s: bot process is not running",
+        payload.get("action"),
+        self.room_url,
+      )
+      return
+    await self._request({"control": payload})
+
+  async def shutdown(self) -> None:
+    proc = self._proc
+    if proc and proc.returncode is None:
+      proc.stdin.close()
+      try:
+        await asyncio.wait_for(proc.wait(), SHUTDOWN_TIMEOUT)
+      except asyncio.TimeoutError:
+        logger.warning("Mandy process %s did not exit, killing it", proc.pid)
+        proc.kill()
+    if self._reader_task:
+      await self._reader_task
+    logger.info("Mandy shutdown complete")
+
+  async def _request(self, message: Dict[str, Any]) -> None:
+    """
+    Send a message to the child and wait until it has been handled. Raises
+    `asyncio.TimeoutError` if no ack arrives within `REQUEST_TIMEOUT`.
+    """
+    request_id = next(self._ids)
+    future = asyncio.get_running_loop().create_future()
+    self._pending[request_id] = future
+    message["id"] = request_id
+    try:
+      self._proc.stdin.write(orjson.dumps(message) + b"\n")
+      await self._proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+      # The reader task settles pending requests once the process is reaped.
+      logger.warning("Mandy process for %s went away mid-request", self.room_url)
+    try:
+      await asyncio.wait_for(future, REQUEST_TIMEOUT)
+    except asyncio.TimeoutError:
+      logger.error(
+        "Mandy process for %s did not acknowledge request %s",
+        self.room_url,
+        request_id,
+      )
+      raise
+    finally:
+      self._pending.pop(request_id, None)
+
+  async def _read_messages(self, proc: asyncio.subprocess.Process) -> None:
+    try:
+      while line := await proc.stdout.readline():
+        # A failure handling one message (a bad payload, or the store behind
+        # the state callback erroring) must not stop the reader: acks would
+        # never resolve again while the child stays in the room.
+        try:
+          await self._handle_message(line)
+        except Exception:
+          logger.exception("Error handling message from Mandy process: %r", line)
+    finally:
+      returncode = await proc.wait()
+      # Requests that raced the exit are settled; their effect (if any) has
+      # already arrived as a state message.
+      for future in self._pending.values():
+        if not future.done():
+          future.set_result(None)
+      self._pending.clear()
+      if self.state.status != "disconnected":
+        logger.warning(
+          "Mandy process for %s exited with code %s", self.room_url, returncode
+        )
+        self.state.status = "disconnected"
+        self.state.invalidate()
+        if self._state_callback:
+          try:
+            await self._state_callback(self.state)
+          except Exception:
+            logger.exception(
+              "Error reporting exit of Mandy process for %s", self.room_url
+            )
+
+  async def _handle_message(self, line: bytes) -> None:
+    try:
+      message = orjson.loads(line)
+    except orjson.JSONDecodeError:
+      logger.warning("Ignoring malformed line from Mandy process: %r", line)
+      return
+    kind = message.get("type")
+    if kind == "state":
+      self.state = MandyRuntimeState.from_payload(message["state"])
+      if self._state_callback:
+        await self._state_callback(self.state)
+    elif kind == "ack":
+      future = self._pending.pop(message["id"], None)
+      if future and not future.done():
+        future.set_result(None)
+
+
+async def _read_initial_state(reader: asyncio.StreamReader) -> MandyRuntimeState:
+  line = await reader.readline()
+  try:
+    payload = orjson.loads(line).get("state")
+  except (orjson.JSONDecodeError, AttributeError):
+    logger.warning("Malformed initial state %r, starting fresh", line)
+    payload = None
+  if not payload:
+    return MandyRuntimeState()
+  state = MandyRuntimeState.from_payload(payload)
+  state.status = "connecting"
+  return state
+
+
+async def run_child(room_url: str, bot_cls: Callable[..., Any]) -> None:
+  """Drive one MandyBot, taking commands on stdin and reporting on stdout."""
+  # Keep a private handle on the real stdout for the protocol and point fd 1
+  # at stderr, so stray prints from dependencies cannot corrupt the channel.
+  channel = os.fdopen(os.dup(1), "wb", buffering=0)
+  os.dup2(2, 1)
+
+  # Write through the event loop: if the parent falls behind, only the
+  # coroutine emitting waits on `drain`, never the audio pipeline.
+  loop = asyncio.get_running_loop()
+  transport, protocol = await loop.connect_write_pipe(
+    asyncio.streams.FlowControlMixin, channel
+  )
+  writer = asyncio.StreamWriter(transport, protocol, None, loop)
+
+  async def emit(message: Dict[str, Any]) -> None:
+    writer.write(orjson.dumps(message) + b"\n")
+    await writer.drain()
+
+  async def on_state(state: MandyRuntimeState) -> None:
+    await emit({"type": "state", "state": state.to_payload()})
+
+  reader = asyncio.StreamReader()
+  await loop.connect_read_pipe(
+    lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+  )
+  state = await _read_initial_state(reader)
+
+  bot = bot_cls(
+    room_url=room_url,
+    daily_token=os.environ.get(TOKEN_ENV, ""),
+    initial_directive=state.directive,
+    state_callback=on_state,
+  )
+  bot.state = state
+
+  # Held while a command (or the final shutdown) is being handled, so the
+  # bot closing underneath a `mandy:stop` does not cut its reply short.
+  busy = asyncio.Lock()
+
+  async def read_commands() -> None:
+    while line := await reader.readline():
+      try:
+        message = orjson.loads(line)
+      except orjson.JSONDecodeError:
+        logger.warning("Ignoring malformed command for %s: %r", room_url, line)
+        continue
+      async with busy:
+        try:
+          await bot.apply_control(message["control"])
+        except Exception:
+          logger.exception("Error handling command for %s", room_url)
+        await emit({"type": "ack", "id": message.get("id")})
+    # EOF: the parent asked us to stop (or went away).
+    async with busy:
+      await bot.shutdown()
+
+  await bot.start()
+  commands = asyncio.create_task(read_commands())
+  await bot.wait_closed()
+  async with busy:
+    commands.cancel()
+  writer.close()
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Run one Mandy bot process.")
+  parser.add_argument("--room-url", required=True)
+  args = parser.parse_args()
+
+  bot_module = _load_bot_module()
+  bot_module.configure_logging(
+    logging.DEBUG if os.environ.get("MANDY_DEBUG") else logging.INFO
+  )
+  bot_module.run_event_loop(run_child(args.room_url, bot_module.MandyBot))
+
+
+if __name__ == "__main__":
+  main()
@@ -1,25 +1,36 @@
 """
-FastAPI control plane for Mandy. This service orchestrates MandyBot instances,
+FastAPI control plane for Mandy. This service orchestrates MandyBot processes,
 keeps track of their shared state, and exposes a simple REST interface that the
 Next.js app can call.
 
-NOTE: This implementation uses an in-memory registry. For production use, swap
-the registry with Redis or another shared store so multiple workers stay in sync.
+State snapshots live in a `StateStore`, backed by Redis when `MANDY_REDIS_URL`
+is set so multiple workers stay in sync. Bots are owned by the worker that
+started them; `/api/start` and `/api/control` requests that land on another
+worker are redirected to the owner's `MANDY_WORKER_URL` as advertised in Redis.
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from typing import Dict, Optional
+import os
+import weakref
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
 
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, RedirectResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 try:
-  from .bot import MandyBot, MandyRuntimeState  # type: ignore
+  from .state import MandyRuntimeState  # type: ignore
+  from .runner import MandyBotProcess  # type: ignore
+  from .store import StateStore  # type: ignore
 except ImportError:  # pragma: no cover - fallback for direct execution
-  from bot import MandyBot, MandyRuntimeState
+  from state import MandyRuntimeState
+  from runner import MandyBotProcess
+  from store import StateStore
 
 logger = logging.getLogger("mandy.server")
 
@@ -42,6 +53,8 @@ class StartRequest(BaseModel):
 
 
 class ControlRequest(BaseModel):
+  model_config = ConfigDict(populate_by_name=True)
+
   domain: str
   room: str
   action: str
@@ -56,23 +69,104 @@ class StateResponse(BaseModel):
   state: Dict[str, object]
 
 
-app = FastAPI(title="Mandy Control Service")
+def _state_response(state: Dict[str, object]) -> ORJSONResponse:
+  # State payloads are built by MandyRuntimeState.to_payload and need no
+  # validation, so encode them straight with orjson. StateResponse stays as
+  # the documented response_model.
+  return ORJSONResponse({"state": state})
+
+
+app = FastAPI(
+  title="Mandy Control Service",
+  default_response_class=ORJSONResponse,
+)
 
-_bots: Dict[str, MandyBot] = {}
-_states: Dict[str, MandyRuntimeState] = {}
-_lock = asyncio.Lock()
+# Bots are owned by this worker (each runs in its own process, see runner.py);
+# their state is shared through the store.
+_bots: Dict[str, MandyBotProcess] = {}
+_worker_url = os.environ.get("MANDY_WORKER_URL")
+_store = StateStore(worker_url=_worker_url)
+_heartbeat_task: Optional[asyncio.Task] = None
+# One lock per room so starts for different rooms proceed concurrently. Values
+# are weakly held: a room's lock disappears once no request is using it.
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+@app.on_event("startup")
+async def _startup() -> None:
+  global _store, _heartbeat_task
+  _store = StateStore.from_url(
+    os.environ.get("MANDY_REDIS_URL"), worker_url=_worker_url
+  )
+  if _store.redis is not None:
+    _heartbeat_task = asyncio.create_task(_heartbeat())
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+  await asyncio.gather(
+    *(bot.shutdown() for bot in list(_bots.values())),
+    return_exceptions=True,
+  )
+  if _heartbeat_task:
+    _heartbeat_task.cancel()
+  await _store.close()
+
+
+async def _heartbeat() -> None:
+  """
+  Refresh ownership and state keys for local bots, so peers keep routing
+  control requests here and a quiet room's state does not expire.
+  """
+  interval = max(_store.ttl / 3, 1)
+  while True:
+    await asyncio.sleep(interval)
+    for room_key, bot in list(_bots.items()):
+      try:
+        if not await _store.claim(room_key):
+          logger.warning("Lost ownership of %s to another worker", room_key)
+          continue
+        await _store.set_state(room_key, bot.state.to_payload())
+      except Exception:  # pragma: no cover - retry on next beat
+        logger.exception("Unable to refresh ownership for %s", room_key)
+
+
+async def _redirect_to_owner(room_key: str, path: str) -> Optional[RedirectResponse]:
+  """Redirect to the worker that owns `room_key`, if that is another worker."""
+  owner = await _store.owner(room_key)
+  if not owner or owner.get("id") == _store.worker_id:
+    return None
+  url = owner.get("url")
+  # A missing URL, or one shared with this worker (replicas behind one
+  # address), cannot route to the owner; redirecting would loop.
+  if not url or url == _worker_url:
+    return None
+  # 307 preserves the POST body when the client follows the redirect.
+  return RedirectResponse(f"{url.rstrip('/')}{path}", status_code=307)
 
 
 def _room_key(domain: str, room: str) -> str:
   return f"{domain}/{room}"
 
 
+def _get_room_lock(room_key: str) -> asyncio.Lock:
+  # No await between lookup and insert, so this is atomic on the event loop.
+  lock = _locks.get(room_key)
+  if lock is None:
+    lock = _locks[room_key] = asyncio.Lock()
+  return lock
+
+
 def _derive_domain(domain: Optional[str], room_url: str) -> str:
   if domain:
     return domain
-  try:
-    from urllib.parse import urlparse
+  return _domain_from_room_url(room_url)
+
 
+@functools.lru_cache(maxsize=1024)
+def _domain_from_room_url(room_url: str) -> str:
+  # Clients call /api/start repeatedly for the same room, so memoize the parse.
+  try:
     parsed = urlparse(room_url)
     host = parsed.hostname or ""
     if host.endswith(".daily.co"):
@@ -84,12 +178,13 @@ def _derive_domain(domain: Optional[str], room_url: str) -> str:
 
 def _make_state_callback(room_key: str):
   async def _callback(state: MandyRuntimeState) -> None:
-    _states[room_key] = state
+    await _store.set_state(room_key, state.to_payload())
     logger.info("State update for %s: status=%s", room_key, state.status)
     logger.debug("Full state for %s: %s", room_key, state.to_payload())
     if state.status == "disconnected":
       logger.warning("Removing bot %s from registry due to disconnected status", room_key)
       removed = _bots.pop(room_key, None)
+      await _store.release(room_key)
       if removed:
         logger.info("Bot %s successfully removed from registry", room_key)
       else:
@@ -98,6 +193,16 @@ def _make_state_callback(room_key: str):
   return _callback
 
 
+async def _apply_control(bot: MandyBotProcess, action_payload: Dict[str, object]) -> None:
+  try:
+    await bot.apply_control(action_payload)
+  except asyncio.TimeoutError:
+    raise HTTPException(
+      status_code=504,
+      detail="Mandy did not respond to the control request in time.",
+    )
+
+
 def _room_url(domain: Optional[str], room: str, room_url: Optional[str]) -> str:
   if room_url:
     return room_url
@@ -110,44 +215,66 @@ def _room_url(domain: Optional[str], room: str, room_url: Optional[str]) -> str:
 
 
 @app.post("/api/start", response_model=StateResponse)
-async def start_mandy(payload: StartRequest) -> StateResponse:
+async def start_mandy(
+  payload: StartRequest,
+) -> Union[ORJSONResponse, RedirectResponse]:
   room_url = _room_url(payload.domain, payload.room, payload.room_url)
   domain_key = _derive_domain(payload.domain, room_url)
   room_key = _room_key(domain_key, payload.room)
 
-  async with _lock:
+  async with _get_room_lock(room_key):
     bot = _bots.get(room_key)
     if not bot:
-      bot = MandyBot(
+      if not await _store.claim(room_key):
+        redirect = await _redirect_to_owner(room_key, "/api/start")
+        if redirect:
+          return redirect
+        raise HTTPException(
+          status_code=409,
+          detail="Mandy is already running on another worker for this room.",
+        )
+      # Resume from the room's last known state (e.g. after a stop) so the
+      # new bot's versions keep increasing for connected clients.
+      previous = await _store.get_state(room_key)
+      bot = MandyBotProcess(
         room_url=room_url,
         daily_token=payload.token or "",
         initial_directive=payload.directive or "",
         state_callback=_make_state_callback(room_key),
+        initial_state=(
+          MandyRuntimeState.from_payload(previous) if previous else None
+        ),
       )
       _bots[room_key] = bot
-      _states[room_key] = bot.state
+      await _store.set_state(room_key, bot.state.to_payload())
     else:
       # Update directive if a new one is supplied
       if payload.directive:
-        await bot.apply_control(
+        await _apply_control(
+          bot,
           {
             "action": "mandy:update_directive",
             "directive": payload.directive,
             "requestedBy": "system",
-          }
+          },
         )
 
     # Ensure the bot is running
     await bot.start()
 
-    return StateResponse(state=bot.state.to_payload())
+    return _state_response(bot.state.to_payload())
 
 
 @app.post("/api/control", response_model=StateResponse)
-async def control_mandy(payload: ControlRequest) -> StateResponse:
+async def control_mandy(
+  payload: ControlRequest,
+) -> Union[ORJSONResponse, RedirectResponse]:
   room_key = _room_key(payload.domain, payload.room)
   bot = _bots.get(room_key)
   if not bot:
+    redirect = await _redirect_to_owner(room_key, "/api/control")
+    if redirect:
+      return redirect
     raise HTTPException(status_code=404, detail="Mandy is not active for this room.")
 
   action_payload = {
@@ -159,22 +286,26 @@ async def control_mandy(payload: ControlRequest) -> StateResponse:
     "version": payload.version,
   }
 
-  await bot.apply_control(action_payload)
-  _states[room_key] = bot.state
+  await _apply_control(bot, action_payload)
+  await _store.set_state(room_key, bot.state.to_payload())
 
   if bot.state.status == "disconnected":
     _bots.pop(room_key, None)
+    await _store.release(room_key)
 
-  return StateResponse(state=bot.state.to_payload())
+  return _state_response(bot.state.to_payload())
 
 
 @app.get("/api/state", response_model=StateResponse)
-async def fetch_state(domain: str, room: str) -> StateResponse:
+async def fetch_state(domain: str, room: str) -> ORJSONResponse:
   room_key = _room_key(domain, room)
-  state = _states.get(room_key)
+  bot = _bots.get(room_key)
+  if bot:
+    return _state_response(bot.state.to_payload())
+  state = await _store.get_state(room_key)
   if not state:
     raise HTTPException(status_code=404, detail="No Mandy state found for this room.")
-  return StateResponse(state=state.to_payload())
+  return _state_response(state)
 
 
 @app.get("/healthz")
@@ -8,4 +8,4 @@ fi
 source .venv/bin/activate
 
 # Start the server
-uvicorn server:app --reload --port 8001
+uvicorn server:app --reload --port 8001 --loop uvloop --http httptools
@@ -0,0 +1,87 @@
+"""
+Runtime state shared by the Mandy bot, its process runner and the control
+plane. Kept free of Pipecat imports so the control plane can load it without
+the voice pipeline dependencies.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _format_utc_ns(timestamp_ns: int) -> str:
+  """Format a `time.time_ns()` value as an ISO-8601 UTC timestamp."""
+  seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+  t = time.gmtime(seconds)
+  return "%04d-%02d-%02dT%02d:%02d:%02d.%06d+00:00" % (
+    t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, nanos // 1000
+  )
+
+
+def _parse_utc_ns(value: str) -> int:
+  """Inverse of `_format_utc_ns` (accepts any ISO-8601 timestamp)."""
+  parsed = datetime.fromisoformat(value)
+  if parsed.tzinfo is None:
+    parsed = parsed.replace(tzinfo=timezone.utc)
+  return (parsed - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+@dataclass(slots=True)
+class MandyRuntimeState:
+  """Authoritative Mandy state for one room; `to_payload` is the wire format."""
+
+  version: int = 0
+  mode: str = "silent"
+  muted: bool = True
+  directive: str = ""
+  locked_by: Optional[str] = None
+  updated_by: Optional[str] = None
+  status: str = "connecting"
+  pending_reason: Optional[str] = None
+  updated_at_ns: int = field(default_factory=time.time_ns)
+  _payload_cache: Optional[Dict[str, Any]] = field(
+    default=None, init=False, repr=False, compare=False
+  )
+  _dirty: bool = field(default=True, init=False, repr=False, compare=False)
+
+  def invalidate(self) -> None:
+    """Mark the cached payload stale; call after mutating any field."""
+    self._dirty = True
+
+  @classmethod
+  def from_payload(cls, payload: Dict[str, Any]) -> "MandyRuntimeState":
+    """Rebuild a state from `to_payload` output (e.g. sent by a bot process)."""
+    return cls(
+      version=payload["version"],
+      mode=payload["mode"],
+      muted=payload["muted"],
+      directive=payload["directive"],
+      locked_by=payload.get("lockedBy"),
+      updated_by=payload.get("updatedBy"),
+      status=payload["status"],
+      pending_reason=payload.get("pendingReason"),
+      updated_at_ns=_parse_utc_ns(payload["updatedAt"]),
+    )
+
+  def to_payload(self) -> Dict[str, Any]:
+    if not self._dirty and self._payload_cache is not None:
+      return self._payload_cache
+    self._payload_cache = {
+      "version": self.version,
+      "mode": self.mode,
+      "muted": self.muted,
+      "directive": self.directive,
+      "lockedBy": self.locked_by,
+      "updatedBy": self.updated_by,
+      "status": self.status,
+      "pendingReason": self.pending_reason,
+      "updatedAt": _format_utc_ns(self.updated_at_ns),
+    }
+    self._dirty = False
+    return self._payload_cache
@@ -0,0 +1,156 @@
+"""
+Shared state store for the Mandy control plane.
+
+State snapshots are written to Redis (when `MANDY_REDIS_URL` is set) so every
+worker serves the same view, and kept in a small per-worker LRU so hot reads
+skip the roundtrip. Bots themselves stay owned by a single worker; that worker
+advertises ownership through a heartbeat key so peers can redirect control
+requests to it. Without Redis the local map is the only copy, so it keeps
+every room (no LRU eviction), as the original in-memory registry did.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger("mandy.store")
+
+STATE_KEY = "mandy:state:{}"
+OWNER_KEY = "mandy:owner:{}"
+
+# Compare-and-set scripts so a worker never refreshes or deletes a claim that
+# has since passed to another worker.
+_REFRESH_IF_OWNER = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+  return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+_DELETE_IF_OWNER = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+  return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class StateStore:
+  """
+  Redis-backed registry of Mandy state payloads with a local LRU in front.
+
+  Local entries expire after `local_ttl` seconds so a worker that does not own
+  a room still picks up updates written by the owning worker.
+
+  Ownership is claimed with a token unique to this process, so workers started
+  from the same environment (or sharing a URL) never mistake each other's
+  claims for their own. The token carries `worker_url`, the address peers
+  redirect to, as a separate field.
+  """
+
+  def __init__(
+    self,
+    redis: Optional[Any] = None,
+    ttl: int = 300,
+    maxsize: int = 1024,
+    local_ttl: float = 1.0,
+    worker_url: Optional[str] = None,
+  ) -> None:
+    self.redis = redis
+    self.worker_id = f"{uuid.uuid4().hex}-{os.getpid()}"
+    self.worker_url = worker_url
+    self._owner_token = orjson.dumps({"id": self.worker_id, "url": worker_url})
+    self.ttl = ttl
+    self.maxsize = maxsize
+    self.local_ttl = local_ttl
+    self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+  @classmethod
+  def from_url(cls, url: Optional[str], **kwargs: Any) -> "StateStore":
+    if not url:
+      return cls(**kwargs)
+    try:
+      from redis import asyncio as aioredis
+    except ImportError as exc:  # pragma: no cover - informative failure
+      raise ImportError(
+        "MANDY_REDIS_URL is set but redis is not installed. Install with "
+        "`pip install redis`."
+      ) from exc
+    return cls(redis=aioredis.from_url(url), **kwargs)
+
+  async def close(self) -> None:
+    if self.redis is not None:
+      await self.redis.aclose()
+
+  def _remember(self, room_key: str, payload: Dict[str, Any]) -> None:
+    self._local[room_key] = (time.monotonic(), payload)
+    self._local.move_to_end(room_key)
+    # Only evict when Redis holds the authoritative copy.
+    if self.redis is not None and len(self._local) > self.maxsize:
+      self._local.popitem(last=False)
+
+  async def set_state(self, room_key: str, payload: Dict[str, Any]) -> None:
+    self._remember(room_key, payload)
+    if self.redis is not None:
+      await self.redis.set(
+        STATE_KEY.format(room_key), orjson.dumps(payload), ex=self.ttl
+      )
+
+  async def get_state(self, room_key: str) -> Optional[Dict[str, Any]]:
+    entry = self._local.get(room_key)
+    if entry is not None:
+      stored_at, payload = entry
+      # Without Redis the local copy is authoritative and never goes stale.
+      if self.redis is None or time.monotonic() - stored_at < self.local_ttl:
+        self._local.move_to_end(room_key)
+        return payload
+    if self.redis is None:
+      return None
+    raw = await self.redis.get(STATE_KEY.format(room_key))
+    if raw is None:
+      self._local.pop(room_key, None)
+      return None
+    payload = orjson.loads(raw)
+    self._remember(room_key, payload)
+    return payload
+
+  async def claim(self, room_key: str) -> bool:
+    """
+    Record this worker as the owner of a room's bot, or refresh an existing
+    claim. Returns False when another worker already owns the room.
+    """
+    if self.redis is None:
+      return True
+    key = OWNER_KEY.format(room_key)
+    if await self.redis.set(key, self._owner_token, ex=self.ttl, nx=True):
+      return True
+    return bool(
+      await self.redis.eval(_REFRESH_IF_OWNER, 1, key, self._owner_token, self.ttl)
+    )
+
+  async def release(self, room_key: str) -> None:
+    """Drop the ownership key, but only if this worker still holds it."""
+    if self.redis is not None:
+      await self.redis.eval(
+        _DELETE_IF_OWNER, 1, OWNER_KEY.format(room_key), self._owner_token
+      )
+
+  async def owner(self, room_key: str) -> Optional[Dict[str, Optional[str]]]:
+    """Return the owning worker as `{"id": ..., "url": ...}`, if any."""
+    if self.redis is None:
+      return None
+    raw = await self.redis.get(OWNER_KEY.format(room_key))
+    if raw is None:
+      return None
+    try:
+      owner = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+      logger.warning("Ignoring malformed owner record for %s: %r", room_key, raw)
+      return None
+    return owner if isinstance(owner, dict) else None
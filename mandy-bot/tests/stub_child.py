@@ -0,0 +1,35 @@
+"""
+Stand-in for runner.py's child side, for driving MandyBotProcess in tests
+without Pipecat. Speaks the same protocol: reads the initial state, reports
+it, then bumps the version and reports state for every control it acks.
+"""
+
+import sys
+
+import orjson
+
+
+def emit(message):
+  sys.stdout.buffer.write(orjson.dumps(message) + b"\n")
+  sys.stdout.buffer.flush()
+
+
+def main():
+  state = orjson.loads(sys.stdin.buffer.readline()).get("state") or {}
+  state["status"] = "online"
+  emit({"type": "state", "state": state})
+  for line in sys.stdin.buffer:
+    message = orjson.loads(line)
+    control = message.get("control", {})
+    state["version"] += 1
+    state["updatedBy"] = control.get("requestedBy")
+    if control.get("action") == "mandy:stop":
+      state["status"] = "disconnected"
+    emit({"type": "state", "state": state})
+    emit({"type": "ack", "id": message["id"]})
+    if state["status"] == "disconnected":
+      return
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from runner import MandyBotProcess  # noqa: E402
+from state import MandyRuntimeState  # noqa: E402
+
+STUB_CHILD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_child.py")
+
+
+class MandyBotProcessTest(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self) -> None:
+    self.updates = []
+    self.failures = 0
+    self.bot = MandyBotProcess(
+      room_url="https://example.daily.co/room",
+      daily_token="token",
+      initial_directive="Be brief.",
+      state_callback=self._callback,
+      runner_path=STUB_CHILD,
+    )
+
+  async def asyncTearDown(self) -> None:
+    await asyncio.wait_for(self.bot.shutdown(), 5)
+
+  async def _callback(self, state) -> None:
+    if self.failures:
+      self.failures -= 1
+      raise RuntimeError("store unavailable")
+    self.updates.append((state.version, state.status))
+
+  async def test_control_round_trip(self) -> None:
+    await self.bot.start()
+    await self.bot.apply_control({"action": "mandy:mute", "requestedBy": "ana"})
+    self.assertEqual(self.bot.state.version, 1)
+    self.assertEqual(self.bot.state.updated_by, "ana")
+    self.assertEqual(self.bot.state.directive, "Be brief.")
+
+  async def test_reader_survives_callback_error(self) -> None:
+    self.failures = 1
+    await self.bot.start()
+    await asyncio.wait_for(
+      self.bot.apply_control({"action": "mandy:mute", "requestedBy": "ana"}), 5
+    )
+    self.assertTrue(self.bot.is_running())
+    self.assertEqual(self.updates[-1], (1, "online"))
+
+  async def test_stop_reports_disconnected(self) -> None:
+    await self.bot.start()
+    await asyncio.wait_for(self.bot.apply_control({"action": "mandy:stop"}), 5)
+    await asyncio.wait_for(self.bot._reader_task, 5)
+    self.assertFalse(self.bot.is_running())
+    self.assertEqual(self.updates[-1], (1, "disconnected"))
+
+
+  async def test_resume_continues_version(self) -> None:
+    previous = MandyRuntimeState(version=4, status="disconnected", directive="Old.")
+    self.bot = MandyBotProcess(
+      room_url="https://example.daily.co/room",
+      daily_token="token",
+      state_callback=self._callback,
+      initial_state=previous,
+      runner_path=STUB_CHILD,
+    )
+    await self.bot.start()
+    await asyncio.wait_for(self.bot.apply_control({"action": "mandy:mute"}), 5)
+    self.assertEqual(self.updates[0], (5, "online"))
+    self.assertEqual(self.bot.state.version, 6)
+    self.assertEqual(self.bot.state.directive, "Old.")
+
+
+if __name__ == "__main__":
+  unittest.main()